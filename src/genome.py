@@ -6,6 +6,12 @@ from abc import (
     # A tag that says that this method must be implemented by a child class
     abstractmethod
 )
+from array import array
+import numpy as np
+from numba import njit
+
+# Byte value of an active TE nucleotide in the bytearray genomes
+_A = ord("A")
 
 
 
@@ -28,7 +34,8 @@ class Genome(ABC):
         already contains TEs, then that TE should be disabled and
         removed from the set of active TEs.
 
-        Returns a new ID for the transposable element.
+        Returns a new ID for the transposable element. Raises ValueError
+        if length is less than 1.
         """
         ...  # not implemented yet
 
@@ -91,55 +98,58 @@ class Genome(ABC):
 
 
 
-class ListGenome(Genome):
+def _fit(arr: np.ndarray, i: int) -> np.ndarray:
+    """Return arr, or a copy of it doubled in size, so arr[i] exists."""
+    if i < len(arr):
+        return arr
+    return np.concatenate((arr, np.zeros_like(arr)))
+
+
+class _RangeGenome(Genome):
     """
-    Representation of a genome.
+    TE bookkeeping shared by the genomes that store each TE as a range.
 
-    Implements the Genome interface using Python's built-in lists
+    The start and length of each TE are kept in numpy arrays indexed by
+    TE ID, so we only store one range per TE rather than an ID per
+    position. Inactive TEs have length 0.
     """
 
     def __init__(self, n: int):
-        """Create a new genome with length n."""
-        self.lst = []
-        self.ID = []
-        for i in range(n):
-            self.lst.append("-")
-            self.ID.append(0)
-        self.active_lst = []
-        self.count = 0 
-
-    def insert_te(self, pos: int, length: int) -> int:
-        """
-        Insert a new transposable element.
-
-        Insert a new transposable element at position pos and len
-        nucleotide forward.
-
-        If the TE collides with an existing TE, i.e. genome[pos]
-        already contains TEs, then that TE should be disabled and
-        removed from the set of active TEs.
-
-        Returns a new ID for the transposable element.
-        """
-        if pos > len(self.lst):
-            pos = pos % len(self.lst)
-
-        self.count += 1 
-        if self.lst[pos] == "A":
-            self.disable_te(self.ID[pos])
-        
-        lst1, ID1 = self.lst[0:pos], self.ID[0:pos]
-        lst2, ID2 = self.lst[pos:], self.ID[pos:]
-        for i in range(length):
-            lst1.append("A")
-            ID1.append(self.count)
-        self.lst = lst1 + lst2
-        self.ID = ID1 + ID2 
-
-        self.active_lst.append(self.count)
-
-        return self.count
+        """Create the bookkeeping for a genome with no TEs."""
+        self.count = 0
+        self.te_start = np.zeros(16, dtype=np.int64)
+        self.te_length = np.zeros(16, dtype=np.int64)
+
+    def _is_active(self, te: int) -> bool:
+        """Check if te is the ID of an active TE."""
+        return 0 < te <= self.count and self.te_length[te] > 0
+
+    def _te_at(self, pos: int) -> int:
+        """Get the ID of the active TE that covers position pos."""
+        # Inactive (and unused) IDs have length 0, so they never match.
+        starts, lengths = self.te_start, self.te_length
+        covers = (starts <= pos) & (pos < starts + lengths)
+        return int(np.flatnonzero(covers)[0])
+
+    def _add_te(self, pos: int, length: int) -> None:
+        """Record TE self.count as inserted at pos."""
+        # Active TEs are never split by an insert, so TEs starting at or
+        # after pos are simply moved length positions up.
+        starts = self.te_start[:self.count]
+        starts[starts >= pos] += length
+        self.te_start = _fit(self.te_start, self.count)
+        self.te_length = _fit(self.te_length, self.count)
+        self.te_start[self.count] = pos
+        self.te_length[self.count] = length
+
+    def _pop_te(self, te: int) -> tuple[int, int] | None:
+        """Make te inactive and get its range, or None if it isn't active."""
+        if not self._is_active(te):
+            return None
 
+        start, length = int(self.te_start[te]), int(self.te_length[te])
+        self.te_length[te] = 0
+        return start, length
 
     def copy_te(self, te: int, offset: int) -> int | None:
         """
@@ -155,23 +165,60 @@ class ListGenome(Genome):
 
         If te is not active, return None (and do not copy it).
         """
+        if not self._is_active(te):
+            return None
 
-        for i in range(len(self.ID)):
-            if self.ID[i] == te:
-                index_ID = i 
-                break
-        
-        if self.lst[index_ID] == "x":
-            return None 
-    
-        len_ID = 0 
-        for i in range(len(self.ID)):
-            if self.ID[i] == te:
-                len_ID += 1 
+        start, length = int(self.te_start[te]), int(self.te_length[te])
+        return self.insert_te(start + offset, length)
 
-        return self.insert_te(index_ID + offset, len_ID)
+    def active_tes(self) -> list[int]:
+        """Get the active TE IDs."""
+        return np.flatnonzero(self.te_length).tolist()
 
 
+class ListGenome(_RangeGenome):
+    """
+    Representation of a genome.
+
+    Implements the Genome interface using a bytearray with one byte per
+    nucleotide. Inserting a TE moves the rest of the genome up in one
+    slice assignment, and TEs are tracked by their ranges rather than
+    with an ID per position.
+    """
+
+    def __init__(self, n: int):
+        """Create a new genome with length n."""
+        # One byte per nucleotide: b"-", b"A" or b"x"
+        super().__init__(n)
+        self.lst = bytearray(b"-" * n)
+
+    def insert_te(self, pos: int, length: int) -> int:
+        """
+        Insert a new transposable element.
+
+        Insert a new transposable element at position pos and len
+        nucleotide forward.
+
+        If the TE collides with an existing TE, i.e. genome[pos]
+        already contains TEs, then that TE should be disabled and
+        removed from the set of active TEs.
+
+        Returns a new ID for the transposable element. Raises ValueError
+        if length is less than 1.
+        """
+        if length < 1:
+            raise ValueError(f"TE length must be at least 1, not {length}")
+
+        pos %= len(self.lst)
+
+        self.count += 1 
+        if self.lst[pos] == _A:
+            self.disable_te(self._te_at(pos))
+
+        self.lst[pos:pos] = b"A" * length
+        self._add_te(pos, length)
+
+        return self.count
 
 
     def disable_te(self, te: int) -> None:
@@ -182,16 +229,13 @@ class ListGenome(Genome):
         TEs are already inactive, so there is no need to do anything
         for those.
         """
-        for i in range(len(self.ID)):
-            if self.ID[i] == te:
-                self.lst[i] = "x"
-        
-        self.active_lst.remove(te)
-        
+        te_range = self._pop_te(te)
+        if te_range is None:
+            return
 
-    def active_tes(self) -> list[int]:
-        """Get the active TE IDs."""
-        return self.active_lst 
+        start, length = te_range
+        self.lst[start:start + length] = b"x" * length
+        
 
     def __len__(self) -> int:
         """Current length of the genome."""
@@ -209,26 +253,25 @@ class ListGenome(Genome):
         represented with the character '-', active TEs with 'A', and disabled
         TEs with 'x'.
         """
-        return "".join(self.lst)
-
-
+        return self.lst.decode("ascii")
 
-#geome = ListGenome(20)
-#print(geome)
-#geome.insert_te(40, 10)
-#print(geome)
-#geome.insert_te(3, 10)
-#print(geome)
 
-#print(geome.active_tes())
+@njit(cache=True)
+def _follow(links, i: int, steps: int) -> int:
+    """Follow links from node i steps times (compiled, it's the hot loop)."""
+    for _ in range(steps):
+        i = links[i]
+    return i
 
-#geome.insert_te(4, 10)
-#print(geome)
 
-#print(geome.active_tes())
-#geome.copy_te(2,12)
-#print(geome)
-#print(geome.active_tes())
+@njit(cache=True)
+def _chain(links, i: int, n: int) -> np.ndarray:
+    """Get the n nodes we visit following links from node i."""
+    nodes = np.empty(n, dtype=np.int64)
+    for k in range(n):
+        nodes[k] = i
+        i = links[i]
+    return nodes
 
 
 class LinkedListGenome(Genome):
@@ -240,16 +283,65 @@ class LinkedListGenome(Genome):
 
     def __init__(self, n: int):
         """Create a new genome with length n."""
-        self.lst = []
-        self.index_next = []
-        self.ID = []
-        for i in range(n):
-            self.lst.append("-")
-            self.index_next.append((i+1) % n)
-            self.ID.append(0)
-        
-        self.active_lst = []
+        # Node i is lst[i], ID[i], index_next[i] and index_prev[i], all
+        # kept in packed arrays of the same length
+        self.lst = bytearray(b"-" * n)
+        self.index_next = array("q", [(i+1) % n for i in range(n)])
+        self.index_prev = array("q", [(i-1) % n for i in range(n)])
+        self.ID = array("q", [0]) * n
+        # The node at position 0 of the genome
+        self.head = 0
+
         self.count = 0 
+        # (head node, length) of each active TE. Dicts keep insertion
+        # order, so the keys are the active TEs in the order they were
+        # created.
+        self.te_info = {}
+
+    def _step(self, i: int, steps: int) -> int:
+        """
+        Get the node steps positions after node i.
+
+        Since the genome is circular we can go either way around, so we
+        follow whichever of index_next and index_prev is shorter.
+        """
+        n = len(self.lst)
+        steps %= n
+        if steps <= n - steps:
+            return _follow(self.index_next, i, steps)
+        return _follow(self.index_prev, i, n - steps)
+
+    def _insert_after(self, i: int, length: int) -> int:
+        """Insert a new TE of the given length after node i."""
+        self.count += 1 
+
+        # The TE goes where the node after i is now, so that is the node
+        # it collides with.
+        old_next = self.index_next[i]
+        if self.lst[old_next] == _A:
+            self.disable_te(self.ID[old_next])
+
+        # The new nodes are added at the end of the arrays, and linked in
+        # between i and the node that used to follow it.
+        first = len(self.lst)
+        last = first + length - 1
+        self.index_next[i] = first
+        self.index_next.extend(range(first + 1, last + 1))
+        self.index_next.append(old_next)
+        self.index_prev.append(i)
+        self.index_prev.extend(range(first, last))
+        self.index_prev[old_next] = last
+
+        self.lst += b"A" * length
+        self.ID += array("q", [self.count]) * length
+
+        self.te_info[self.count] = (first, length)
+        # Inserting at position 0 puts the TE at the start of the genome,
+        # as it does for the other genomes, not at its end.
+        if old_next == self.head:
+            self.head = first
+
+        return self.count
 
     def insert_te(self, pos: int, length: int) -> int:
         """
@@ -262,34 +354,13 @@ class LinkedListGenome(Genome):
         already contains TEs, then that TE should be disabled and
         removed from the set of active TEs.
 
-        Returns a new ID for the transposable element.
+        Returns a new ID for the transposable element. Raises ValueError
+        if length is less than 1.
         """
-        
-        self.count += 1 
-
-        i = 0
-        count = 0 
-        for _ in range(pos-1):
-            i = self.index_next[i]
-            count+=1
-        
-        if self.lst[i] == "A":
-            self.disable_te(self.ID[i])
-        
-        old_next = self.index_next[i]
-        self.index_next[i] = len(self.lst)
-        for _ in range(length-1):
-            self.index_next.append(len(self.index_next)+1)
-        self.index_next.append(old_next)
-
+        if length < 1:
+            raise ValueError(f"TE length must be at least 1, not {length}")
 
-        for i in range(length):
-            self.lst.append("A")
-            self.ID.append(self.count)
-
-        self.active_lst.append(self.count)
-
-        return self.count
+        return self._insert_after(self._step(self.head, pos - 1), length)
 
 
     def copy_te(self, te: int, offset: int) -> int | None:
@@ -306,22 +377,12 @@ class LinkedListGenome(Genome):
 
         If te is not active, return None (and do not copy it).
         """ 
-        if te not in self.active_lst:
+        if te not in self.te_info:
             return None
 
-        i = 0
-        count = 0
-        while self.ID[i] != te:
-            i = self.index_next[i]
-            count += 1
-        te_pos = count 
-        count = 0
-        while self.ID[i] == te:
-            i = self.index_next[i]
-            count += 1
-        print(self.index_next)
-        print(te_pos)
-        return self.insert_te(len(self.index_next) + (te_pos+offset), count)
+        head, length = self.te_info[te]
+        # Walk from the TE itself rather than from the start of the genome
+        return self._insert_after(self._step(head, offset - 1), length)
 
 
     def disable_te(self, te: int) -> None:
@@ -332,15 +393,17 @@ class LinkedListGenome(Genome):
         TEs are already inactive, so there is no need to do anything
         for those.
         """
-        for i in range(len(self.ID)):
-            if self.ID[i] == te:
-                self.lst[i] = "x"
-        
-        self.active_lst.remove(te)
+        if te not in self.te_info:
+            return
+
+        # A TE's nodes are added in one go, so they are next to each other
+        # in the arrays even though they are linked into the middle.
+        head, length = self.te_info.pop(te)
+        self.lst[head:head + length] = b"x" * length
 
     def active_tes(self) -> list[int]:
         """Get the active TE IDs."""
-        return self.active_lst
+        return list(self.te_info)
 
     def __len__(self) -> int:
         """Current length of the genome."""
@@ -358,28 +421,122 @@ class LinkedListGenome(Genome):
         represented with the character '-', active TEs with 'A', and disabled
         TEs with 'x'.
         """
-        self.new = []
-        i = 0
-        while len( self.new) != len(self.lst): 
-            self.new.append(self.lst[i])
-            i = self.index_next[i]
-        return "".join( self.new)
-
-#geome = LinkedListGenome(4)
-#print(geome)
-##geome.insert_te(1, 2)
-#print(geome)
-#print(geome.active_tes())
-#geome.insert_te(2, 2)
-#print(geome)
-
-#geome2 = LinkedListGenome(20)
-#print(geome2)
-#geome2.insert_te(5, 10) 
-#print(geome2)
-#geome2.insert_te(10, 10)
-#print(geome2)
-#geome2.copy_te(2, 20)
-#print(geome2)
-#geome2.copy_te(2, -15)
-#print(geome2)
\ No newline at end of file
+        nodes = _chain(self.index_next, self.head, len(self.lst))
+        nucleotides = np.frombuffer(self.lst, np.uint8)[nodes]
+        return nucleotides.tobytes().decode("ascii")
+
+
+class GapBufferGenome(_RangeGenome):
+    """
+    Representation of a genome.
+
+    Implements the Genome interface using a gap buffer. The nucleotides
+    before the gap are kept in one bytearray and the nucleotides after
+    it, in reverse order, in another, so inserting at the gap only
+    appends to the first and we only move the nucleotides between the
+    old and the new gap position.
+    """
+
+    def __init__(self, n: int):
+        """Create a new genome with length n."""
+        super().__init__(n)
+        self.left = bytearray()
+        self.right = bytearray(b"-" * n)
+
+    def _move_gap(self, pos: int) -> None:
+        """Move the gap so it sits just before position pos."""
+        split = len(self.left)
+        if pos < split:
+            self.right += self.left[pos:][::-1]
+            del self.left[pos:]
+        elif pos > split:
+            i = len(self.right) - (pos - split)
+            self.left += self.right[i:][::-1]
+            del self.right[i:]
+
+    def insert_te(self, pos: int, length: int) -> int:
+        """
+        Insert a new transposable element.
+
+        Insert a new transposable element at position pos and len
+        nucleotide forward.
+
+        If the TE collides with an existing TE, i.e. genome[pos]
+        already contains TEs, then that TE should be disabled and
+        removed from the set of active TEs.
+
+        Returns a new ID for the transposable element. Raises ValueError
+        if length is less than 1.
+        """
+        if length < 1:
+            raise ValueError(f"TE length must be at least 1, not {length}")
+
+        pos %= len(self)
+
+        self.count += 1
+        self._move_gap(pos)
+        if self.right[-1] == _A:
+            self.disable_te(self._te_at(pos))
+
+        self.left += b"A" * length
+        self._add_te(pos, length)
+
+        return self.count
+
+    def disable_te(self, te: int) -> None:
+        """
+        Disable a TE.
+
+        If te is an active TE, then make it inactive. Inactive
+        TEs are already inactive, so there is no need to do anything
+        for those.
+        """
+        te_range = self._pop_te(te)
+        if te_range is None:
+            return
+
+        start, length = te_range
+        end = start + length
+        split = len(self.left)
+        if start < split:
+            stop = min(end, split)
+            self.left[start:stop] = b"x" * (stop - start)
+        if end > split:
+            # Position p after the gap is at index len(right) - 1 - (p - split)
+            first = max(start, split)
+            r = len(self.right)
+            self.right[r - (end - split):r - (first - split)] = \
+                b"x" * (end - first)
+
+    def __len__(self) -> int:
+        """Current length of the genome."""
+        return len(self.left) + len(self.right)
+
+    def __str__(self) -> str:
+        """
+        Return a string representation of the genome.
+
+        Create a string that represents the genome. By nature, it will be
+        linear, but imagine that the last character is immidiatetly followed
+        by the first.
+
+        The genome should start at position 0. Locations with no TE should be
+        represented with the character '-', active TEs with 'A', and disabled
+        TEs with 'x'.
+        """
+        return (self.left + self.right[::-1]).decode("ascii")
+
+
+if __name__ == "__main__":
+    for genome_class in (ListGenome, LinkedListGenome, GapBufferGenome):
+        geome = genome_class(20)
+        print(geome)
+        geome.insert_te(5, 10)
+        print(geome)
+        geome.insert_te(10, 10)
+        print(geome)
+        geome.copy_te(2, 20)
+        print(geome)
+        geome.copy_te(2, -15)
+        print(geome)
+        print(geome.active_tes())
@@ -8,7 +8,8 @@ from typing import Type
 from genome import (
     Genome,
     ListGenome,
-    LinkedListGenome
+    LinkedListGenome,
+    GapBufferGenome
 )
 from dataclasses import dataclass
 
@@ -87,4 +88,9 @@ if __name__ == '__main__':
     start_time = timeit.default_timer()
     sim_te(1_000_000, 1000, genome_class=LinkedListGenome)
     elapsed = timeit.default_timer() - start_time
-    print("Linked lists:", elapsed)
\ No newline at end of file
+    print("Linked lists:", elapsed)
+
+    start_time = timeit.default_timer()
+    sim_te(1_000_000, 1000, genome_class=GapBufferGenome)
+    elapsed = timeit.default_timer() - start_time
+    print("Gap buffer:", elapsed)
\ No newline at end of file
@@ -8,9 +8,11 @@
 from genome import (
     Genome,
     ListGenome,
-    LinkedListGenome
+    LinkedListGenome,
+    GapBufferGenome
 )
 from typing import Type
+import pytest
 
 
 def run_genome_test(genome_class: Type[Genome]) -> None:
@@ -27,6 +29,11 @@ def run_genome_test(genome_class: Type[Genome]) -> None:
     assert str(genome) == "-----xxxxxAAAAAAAAAAxxxxx---------------"
     assert genome.active_tes() == [2]
 
+    # TE 1 is already disabled, so disabling it again does nothing
+    genome.disable_te(1)
+    assert str(genome) == "-----xxxxxAAAAAAAAAAxxxxx---------------"
+    assert genome.active_tes() == [2]
+
     # Make TE 3 20 to the right of the start of 2
     assert 3 == genome.copy_te(2, 20)
     assert str(genome) == "-----xxxxxAAAAAAAAAAxxxxx-----AAAAAAAAAA----------"
@@ -50,6 +57,53 @@ def run_genome_test(genome_class: Type[Genome]) -> None:
         "xxxxxxxxxx-----xxxxxAAAAAAAAAAxxxxx-----"
     assert genome.active_tes() == [2, 5]
 
+    # Inserting at len(genome) wraps around to position 0
+    assert 6 == genome.insert_te(len(genome), 5)
+    assert str(genome) == \
+        "AAAAA-----xxxxxAAAAAAAAAAxxxxx-----" \
+        "xxxxxxxxxx-----xxxxxAAAAAAAAAAxxxxx-----"
+    assert genome.active_tes() == [2, 5, 6]
+
+    # and negative positions count from the end of the genome
+    assert 7 == genome.insert_te(-3, 2)
+    assert str(genome) == \
+        "AAAAA-----xxxxxAAAAAAAAAAxxxxx-----" \
+        "xxxxxxxxxx-----xxxxxAAAAAAAAAAxxxxx--AA---"
+    assert genome.active_tes() == [2, 5, 6, 7]
+
+    genome = genome_class(20)
+    assert 1 == genome.insert_te(5, 3)
+    assert str(genome) == "-----AAA---------------"
+
+    # An offset further left than the genome is long wraps around
+    assert 2 == genome.copy_te(1, -30)
+    assert str(genome) == "-----AAA-------------AAA--"
+
+    # A short offset to the left, going backwards from the TE
+    assert 3 == genome.copy_te(1, -3)
+    assert str(genome) == "--AAA---AAA-------------AAA--"
+    assert genome.active_tes() == [1, 2, 3]
+
+    # Inserting exactly at the start of an active TE collides with it
+    genome = genome_class(20)
+    assert 1 == genome.insert_te(5, 10)
+    assert 2 == genome.insert_te(5, 3)
+    assert str(genome) == "-----AAAxxxxxxxxxx---------------"
+    assert genome.active_tes() == [2]
+
+    # but inserting just past its end does not
+    genome = genome_class(20)
+    assert 1 == genome.insert_te(5, 10)
+    assert 2 == genome.insert_te(15, 3)
+    assert str(genome) == "-----AAAAAAAAAAAAA---------------"
+    assert genome.active_tes() == [1, 2]
+
+    # A TE must cover at least one nucleotide
+    with pytest.raises(ValueError):
+        genome.insert_te(5, 0)
+    assert str(genome) == "-----AAAAAAAAAAAAA---------------"
+    assert genome.active_tes() == [1, 2]
+
 
 def test_list_genome() -> None:
     """Test that the Python list implementation works."""
@@ -59,3 +113,8 @@ def test_list_genome() -> None:
 def test_linked_list_genome() -> None:
     """Test that the linked list implementation works."""
     run_genome_test(LinkedListGenome)
+
+
+def test_gap_buffer_genome() -> None:
+    """Test that the gap buffer implementation works."""
+    run_genome_test(GapBufferGenome)